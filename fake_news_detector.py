@@ -2,6 +2,19 @@ import streamlit as st
 import re
 from collections import Counter
 
+# Words and single punctuation marks. Single-word keywords match on the same
+# boundaries as \b, but whitespace is dropped, so phrases match across any run of
+# spaces, tabs or newlines (or a stripped URL) between their words.
+_SCAN_TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+# Faster twin for ASCII-only text. Unicode \s also covers \x1c-\x1f, so those are
+# excluded explicitly to give the same tokens as _SCAN_TOKEN_RE.
+_SCAN_TOKEN_ASCII_RE = re.compile(r'\w+|[^\w\s\x1c-\x1f]', re.ASCII)
+_URL_RE = re.compile(r'http\S+|www\.\S+')
+_EXCESS_PUNCT_RE = re.compile(r'[!?]{2,}')
+
+# Only this many characters are analyzed, bounding the cost of huge pastes
+MAX_TEXT_LENGTH = 100_000
+
 # Page configuration
 st.set_page_config(
     page_title="Fake News Detector",
@@ -78,89 +91,148 @@ class SimpleFakeNewsDetector:
             'dates': ['2024', '2025', 'january', 'february', 'march', 'april', 'may', 'june',
                      'july', 'august', 'september', 'october', 'november', 'december']
         }
+        
+        # Flat, index-aligned copies of the category config for the scan loop.
+        # Indicator categories come first, then credibility marker categories.
+        self.indicator_categories = tuple(self.indicators)
+        self.indicator_weights = tuple(data['weight'] for data in self.indicators.values())
+        self.marker_categories = tuple(self.credibility_markers)
+        
+        # Token trie of every keyword, so a single pass over the text finds them all
+        self.keyword_trie = self.build_keyword_trie()
+    
+    def build_keyword_trie(self):
+        """Build a token trie holding all indicator and credibility keywords"""
+        keyword_lists = [data['keywords'] for data in self.indicators.values()]
+        keyword_lists += list(self.credibility_markers.values())
+        
+        trie = {}
+        for slot, keywords in enumerate(keyword_lists):
+            for keyword in keywords:
+                node = trie
+                for token in _SCAN_TOKEN_RE.findall(keyword):
+                    node = node.setdefault(token, {})
+                # The None key holds a tuple of the (slot, keyword) pairs ending here
+                node[None] = node.get(None, ()) + ((slot, keyword),)
+        
+        return trie
     
     def preprocess_text(self, text):
         """Clean and preprocess text"""
         text = text.lower()
-        text = re.sub(r'http\S+|www.\S+', '', text)  # Remove URLs
+        text = _URL_RE.sub('', text)  # Remove URLs
         return text
     
-    def detect_fake_indicators(self, text):
-        """Detect fake news indicators in text"""
-        preprocessed = self.preprocess_text(text)
+    def _scan_keywords(self, preprocessed):
+        """Find indicator and credibility keywords in preprocessed text in one pass"""
+        token_re = _SCAN_TOKEN_ASCII_RE if preprocessed.isascii() else _SCAN_TOKEN_RE
+        tokens = token_re.findall(preprocessed)
+        slot_count = len(self.indicator_categories) + len(self.marker_categories)
+        counts = [0] * slot_count
+        found = [{} for _ in range(slot_count)]  # Insertion-ordered keyword sets
+        
+        # Walk the trie from every token so overlapping keywords all match.
+        # Most tokens start no keyword and cost a single dict lookup. Phrase
+        # words only need to be adjacent tokens, whatever whitespace separates them.
+        token_count = len(tokens)
+        for start, token in enumerate(tokens):
+            node = self.keyword_trie.get(token)
+            end = start + 1
+            while node is not None:
+                for slot, keyword in node.get(None, ()):
+                    counts[slot] += 1
+                    found[slot][keyword] = None
+                node = node.get(tokens[end]) if end < token_count else None
+                end += 1
+        
         indicator_counts = {}
         total_score = 0
-        
-        for category, data in self.indicators.items():
-            count = 0
-            found_keywords = []
-            
-            for keyword in data['keywords']:
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                matches = re.findall(pattern, preprocessed)
-                if matches:
-                    count += len(matches)
-                    found_keywords.append(keyword)
-            
+        for slot, category in enumerate(self.indicator_categories):
+            count = counts[slot]
             if count > 0:
+                weight = self.indicator_weights[slot]
                 indicator_counts[category] = {
                     'count': count,
-                    'keywords': found_keywords,
-                    'weight': data['weight']
+                    'keywords': list(found[slot]),
+                    'weight': weight
                 }
-                total_score += count * data['weight']
+                total_score += count * weight
         
-        return indicator_counts, total_score
-    
-    def detect_credibility_markers(self, text):
-        """Detect credibility markers"""
-        preprocessed = self.preprocess_text(text)
-        credibility_score = 0
         markers_found = {}
-        
-        for category, keywords in self.credibility_markers.items():
-            count = 0
-            for keyword in keywords:
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                matches = re.findall(pattern, preprocessed)
-                count += len(matches)
-            
+        credibility_score = 0
+        for slot, category in enumerate(self.marker_categories, len(self.indicator_categories)):
+            count = counts[slot]
             if count > 0:
                 markers_found[category] = count
                 credibility_score += count
         
-        return markers_found, credibility_score
+        return indicator_counts, total_score, markers_found, credibility_score
     
-    def analyze_text_features(self, text):
-        """Analyze various text features"""
-        words = text.split()
-        sentences = text.split('.')
-        
-        # Count features
-        word_count = len(words)
-        sentence_count = len([s for s in sentences if s.strip()])
-        avg_word_length = sum(len(word) for word in words) / max(len(words), 1)
-        
-        # Capitalization abuse
-        caps_words = [word for word in words if word.isupper() and len(word) > 2]
-        caps_ratio = len(caps_words) / max(word_count, 1)
+    def _text_features(self, text):
+        """Count word, caps, sentence and punctuation features in one pass"""
+        word_count = 0
+        total_word_length = 0
+        caps_count = 0
+        sentence_count = 0
+        question_count = 0
+        open_sentence = False
+        for word in text.split():
+            word_length = len(word)
+            word_count += 1
+            total_word_length += word_length
+            if word_length > 2 and word.isupper():
+                caps_count += 1
+            
+            # A word ending in a terminator closes the current sentence
+            if word[-1] in '.!?':
+                sentence_count += 1
+                if word[-1] == '?':
+                    question_count += 1
+                open_sentence = False
+            else:
+                open_sentence = True
+        if open_sentence:
+            sentence_count += 1
         
         # Excessive punctuation
-        excessive_punct = len(re.findall(r'[!?]{2,}', text))
-        
-        # Question ratio
-        questions = len([s for s in sentences if s.strip().endswith('?')])
-        question_ratio = questions / max(sentence_count, 1)
+        excessive_punct = len(_EXCESS_PUNCT_RE.findall(text))
         
         return {
             'word_count': word_count,
             'sentence_count': sentence_count,
-            'avg_word_length': avg_word_length,
-            'caps_ratio': caps_ratio,
+            'avg_word_length': total_word_length / max(word_count, 1),
+            'caps_ratio': caps_count / max(word_count, 1),
             'excessive_punctuation': excessive_punct,
-            'question_ratio': question_ratio
+            'question_ratio': question_count / max(sentence_count, 1)
+        }
+    
+    def _scan_all(self, text):
+        """Run keyword detection and text feature analysis"""
+        indicator_counts, total_score, markers_found, credibility_score = \
+            self._scan_keywords(self.preprocess_text(text))
+        
+        return {
+            'indicators': indicator_counts,
+            'fake_score': total_score,
+            'credibility_markers': markers_found,
+            'credibility_score': credibility_score,
+            'text_features': self._text_features(text)
         }
     
+    def detect_fake_indicators(self, preprocessed):
+        """Detect fake news indicators in preprocessed text"""
+        indicator_counts, total_score, _, _ = self._scan_keywords(preprocessed)
+        return indicator_counts, total_score
+    
+    def detect_credibility_markers(self, preprocessed):
+        """Detect credibility markers in preprocessed text"""
+        _, _, markers_found, credibility_score = self._scan_keywords(preprocessed)
+        return markers_found, credibility_score
+    
+    def analyze_text_features(self, text):
+        """Analyze various text features"""
+        return self._text_features(text)
+    
     def calculate_final_score(self, fake_score, credibility_score, text_features):
         """Calculate final fake news probability score"""
         # Normalize scores
@@ -209,22 +281,22 @@ class SimpleFakeNewsDetector:
         """Main analysis function"""
         if not text or len(text.strip()) < 10:
             return None
+        text = text[:MAX_TEXT_LENGTH]
         
         # Run all analyses
-        indicators, fake_score = self.detect_fake_indicators(text)
-        markers, cred_score = self.detect_credibility_markers(text)
-        text_features = self.analyze_text_features(text)
+        scan = self._scan_all(text)
         
         # Calculate final score
-        final_score = self.calculate_final_score(fake_score, cred_score, text_features)
+        final_score = self.calculate_final_score(scan['fake_score'], scan['credibility_score'],
+                                                 scan['text_features'])
         verdict = self.get_verdict(final_score)
         
         return {
             'score': final_score,
             'verdict': verdict,
-            'indicators': indicators,
-            'credibility_markers': markers,
-            'text_features': text_features
+            'indicators': scan['indicators'],
+            'credibility_markers': scan['credibility_markers'],
+            'text_features': scan['text_features']
         }
 
 
@@ -233,7 +305,13 @@ class SimpleFakeNewsDetector:
 def get_detector():
     return SimpleFakeNewsDetector()
 
-detector = get_detector()
+# Analysis is deterministic, so reruns on the same text reuse the last result
+@st.cache_data(max_entries=256, show_spinner=False)
+def analyze_cached(text):
+    return get_detector().analyze(text)
+
+# Build the shared detector (and its keyword trie) up front, not on the first analysis
+get_detector()
 
 # App Header
 st.markdown('<p class="big-font">📰 Fake News Detector</p>', unsafe_allow_html=True)
@@ -301,84 +379,106 @@ if 'example_text' in st.session_state:
 with col2:
     st.subheader("🎯 Quick Stats")
     if text_input:
-        char_count = len(text_input)
-        word_count = len(text_input.split())
-        st.metric("Characters", char_count)
-        st.metric("Words", word_count)
+        # Only recount when the text has changed since the last rerun
+        stats = st.session_state.get('text_stats')
+        if not stats or stats['text'] != text_input:
+            stats = {
+                'text': text_input,
+                'char_count': len(text_input),
+                'word_count': len(text_input.split())
+            }
+            st.session_state.text_stats = stats
+        st.metric("Characters", stats['char_count'])
+        st.metric("Words", stats['word_count'])
     else:
         st.info("Enter text to see statistics")
 
 # Analyze button
+analyzed_text = text_input[:MAX_TEXT_LENGTH]
 if st.button("🔍 Analyze Article", type="primary", use_container_width=True):
     if not text_input or len(text_input.strip()) < 10:
         st.error("⚠️ Please enter at least 10 characters of text to analyze.")
+        st.session_state.pop('last_result', None)
     else:
         with st.spinner("🔄 Analyzing text with NLP algorithms..."):
-            result = detector.analyze(text_input)
-            
-            if result:
-                st.markdown("---")
-                st.subheader("📊 Analysis Results")
-                
-                # Score display
-                score_col1, score_col2, score_col3 = st.columns([1, 2, 1])
-                
-                with score_col2:
-                    verdict = result['verdict']
-                    st.markdown(f"<h1 style='text-align: center; color: {verdict['color']};'>{verdict['label']}</h1>", unsafe_allow_html=True)
-                    st.markdown(f"<h2 style='text-align: center;'>{result['score']}/100</h2>", unsafe_allow_html=True)
-                    
-                    # Progress bar
-                    st.progress(result['score'] / 100)
-                    
-                    if result['score'] < 30:
-                        st.success(verdict['description'])
-                    elif result['score'] < 60:
-                        st.warning(verdict['description'])
-                    else:
-                        st.error(verdict['description'])
-                    
-                    st.info(f"**Recommendation:** {verdict['recommendation']}")
-                
-                # Detailed metrics
-                st.markdown("---")
-                metric_col1, metric_col2, metric_col3 = st.columns(3)
-                
-                with metric_col1:
-                    st.metric("Fake News Score", f"{result['score']}/100")
-                    st.metric("Word Count", result['text_features']['word_count'])
-                
-                with metric_col2:
-                    st.metric("Avg Word Length", f"{result['text_features']['avg_word_length']:.1f}")
-                    st.metric("Sentences", result['text_features']['sentence_count'])
-                
-                with metric_col3:
-                    st.metric("CAPS Abuse", f"{result['text_features']['caps_ratio']:.1%}")
-                    st.metric("Exclamation Abuse", result['text_features']['excessive_punctuation'])
-                
-                # Red flags detected
-                st.markdown("---")
-                st.subheader("🚩 Red Flags Detected")
-                
-                if result['indicators']:
-                    for category, data in sorted(result['indicators'].items(), key=lambda x: x[1]['count'], reverse=True):
-                        with st.expander(f"**{category.replace('_', ' ').title()}** - Found {data['count']} times"):
-                            st.write(f"**Severity Weight:** {data['weight']}")
-                            st.write(f"**Keywords Found:** {', '.join(data['keywords'][:5])}")
-                else:
-                    st.success("✅ No major red flags detected!")
-                
-                # Credibility markers
-                st.markdown("---")
-                st.subheader("✅ Credibility Markers")
-                
-                if result['credibility_markers']:
-                    cred_cols = st.columns(len(result['credibility_markers']))
-                    for idx, (category, count) in enumerate(result['credibility_markers'].items()):
-                        with cred_cols[idx]:
-                            st.metric(category.title(), count)
-                else:
-                    st.warning("⚠️ No credibility markers found")
+            st.session_state.last_result = {
+                'text': analyzed_text,
+                'truncated': len(text_input) > MAX_TEXT_LENGTH,
+                'result': analyze_cached(analyzed_text)
+            }
+
+# Keep showing the last result only while the text it was computed from is unchanged
+last_result = st.session_state.get('last_result')
+if last_result and last_result['text'] != analyzed_text:
+    st.session_state.pop('last_result')
+    last_result = None
+result = last_result['result'] if last_result else None
+if result:
+    st.markdown("---")
+    st.subheader("📊 Analysis Results")
+    
+    if last_result['truncated']:
+        st.warning(f"⚠️ Text is longer than {MAX_TEXT_LENGTH:,} characters. Only the first {MAX_TEXT_LENGTH:,} were analyzed.")
+    
+    # Score display
+    score_col1, score_col2, score_col3 = st.columns([1, 2, 1])
+    
+    with score_col2:
+        verdict = result['verdict']
+        st.markdown(f"<h1 style='text-align: center; color: {verdict['color']};'>{verdict['label']}</h1>", unsafe_allow_html=True)
+        st.markdown(f"<h2 style='text-align: center;'>{result['score']}/100</h2>", unsafe_allow_html=True)
+    
+        # Progress bar
+        st.progress(result['score'] / 100)
+    
+        if result['score'] < 30:
+            st.success(verdict['description'])
+        elif result['score'] < 60:
+            st.warning(verdict['description'])
+        else:
+            st.error(verdict['description'])
+    
+        st.info(f"**Recommendation:** {verdict['recommendation']}")
+    
+    # Detailed metrics
+    st.markdown("---")
+    metric_col1, metric_col2, metric_col3 = st.columns(3)
+    
+    with metric_col1:
+        st.metric("Fake News Score", f"{result['score']}/100")
+        st.metric("Word Count", result['text_features']['word_count'])
+    
+    with metric_col2:
+        st.metric("Avg Word Length", f"{result['text_features']['avg_word_length']:.1f}")
+        st.metric("Sentences", result['text_features']['sentence_count'])
+    
+    with metric_col3:
+        st.metric("CAPS Abuse", f"{result['text_features']['caps_ratio']:.1%}")
+        st.metric("Exclamation Abuse", result['text_features']['excessive_punctuation'])
+    
+    # Red flags detected
+    st.markdown("---")
+    st.subheader("🚩 Red Flags Detected")
+    
+    if result['indicators']:
+        for category, data in sorted(result['indicators'].items(), key=lambda x: x[1]['count'], reverse=True):
+            with st.expander(f"**{category.replace('_', ' ').title()}** - Found {data['count']} times"):
+                st.write(f"**Severity Weight:** {data['weight']}")
+                st.write(f"**Keywords Found:** {', '.join(data['keywords'][:5])}")
+    else:
+        st.success("✅ No major red flags detected!")
+    
+    # Credibility markers
+    st.markdown("---")
+    st.subheader("✅ Credibility Markers")
+    
+    if result['credibility_markers']:
+        cred_cols = st.columns(len(result['credibility_markers']))
+        for idx, (category, count) in enumerate(result['credibility_markers'].items()):
+            with cred_cols[idx]:
+                st.metric(category.title(), count)
+    else:
+        st.warning("⚠️ No credibility markers found")
 
 # Footer
 st.markdown("---")